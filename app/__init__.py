@@ -7,7 +7,7 @@ import logging
 db = SQLAlchemy()
 login_manager = LoginManager()
 
-def create_app():
+def create_app(config_class=None):
     app = Flask(__name__)
     
     # Configure logging
@@ -27,6 +27,11 @@ def create_app():
     app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///game_checklist.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
+    # Overrides must be applied before db.init_app, which binds the engine
+    # to the configured database URI
+    if config_class is not None:
+        app.config.from_object(config_class)
+    
     # Initialize extensions
     logger.debug("Initializing database and login manager")
     db.init_app(app)
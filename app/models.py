@@ -1,4 +1,5 @@
 from app import db, login_manager
+from flask import current_app, has_app_context
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
@@ -44,7 +45,10 @@ class User(UserMixin, db.Model):
     def set_password(self, password):
         # Use pbkdf2:sha256 method for better compatibility across Python versions
         # Some Python builds (e.g., macOS Python 3.9) may not have scrypt available
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        method = 'pbkdf2:sha256'
+        if has_app_context():
+            method = current_app.config.get('PASSWORD_HASH_METHOD', method)
+        self.password_hash = generate_password_hash(password, method=method)
     
     @log_function_call
     def check_password(self, password):
@@ -232,16 +236,17 @@ class UserChecklist(db.Model):
             If reward_id is provided: int (total amount of that reward)
             If reward_id is None: dict {reward_id: total_amount, ...}
         """
-        # Get all completed items for this user checklist
-        completed_progress = self.progress_items.filter_by(completed=True).all()
-        completed_item_ids = [p.item_id for p in completed_progress]
-        
-        if not completed_item_ids:
-            return 0 if reward_id else {}
+        # Select the completed items as a subquery so the tally is a single
+        # round trip, however many items the user has completed
+        completed_item_ids = db.select(UserProgress.item_id).filter_by(
+            user_checklist_id=self.id, completed=True
+        )
         
-        # Query for items with rewards
-        query = db.session.query(ChecklistItem, ItemReward).join(
-            ItemReward, ChecklistItem.id == ItemReward.checklist_item_id
+        # Sum the reward amounts of completed items, per reward
+        query = db.session.query(
+            ItemReward.reward_id, db.func.sum(ItemReward.amount)
+        ).join(
+            ChecklistItem, ChecklistItem.id == ItemReward.checklist_item_id
         ).filter(
             ChecklistItem.id.in_(completed_item_ids)
         )
@@ -258,18 +263,15 @@ class UserChecklist(db.Model):
         if reward_id is not None:
             query = query.filter(ItemReward.reward_id == reward_id)
         
-        results = query.all()
+        tally = dict(query.group_by(ItemReward.reward_id).all())
         
         if reward_id is not None:
-            # Return total amount for specific reward
-            return sum(item_reward.amount for _, item_reward in results)
+            # Return total amount for specific reward. The query already kept
+            # only that reward, so sum rather than look the id up as a key,
+            # which would miss an id passed as a different type (e.g. '3')
+            return sum(tally.values())
         else:
             # Return dict of all rewards
-            tally = {}
-            for _, item_reward in results:
-                if item_reward.reward_id not in tally:
-                    tally[item_reward.reward_id] = 0
-                tally[item_reward.reward_id] += item_reward.amount
             return tally
     
     @log_function_call
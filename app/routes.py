@@ -1101,16 +1101,17 @@ def get_rewards(checklist_id):
     if not checklist.is_public and (not current_user.is_authenticated or checklist.creator_id != current_user.id):
         abort(403)
     
-    # Get all items for this checklist
-    items = ChecklistItem.query.filter_by(checklist_id=checklist_id).all()
-    
-    # Get unique rewards across all items
-    rewards_set = set()
-    for item in items:
-        for item_reward in item.rewards:
-            rewards_set.add(item_reward.reward.name)
+    # Get unique rewards across all items in one query, rather than lazy
+    # loading each item's rewards and then each reward row
+    rewards = db.session.query(Reward.name).join(
+        ItemReward, ItemReward.reward_id == Reward.id
+    ).join(
+        ChecklistItem, ChecklistItem.id == ItemReward.checklist_item_id
+    ).filter(
+        ChecklistItem.checklist_id == checklist_id
+    ).distinct().order_by(Reward.name).all()
     
-    reward_list = sorted(list(rewards_set))
+    reward_list = [reward[0] for reward in rewards]
     return jsonify({'rewards': reward_list})
 
 @checklist_bp.route('/<int:checklist_id>/delete', methods=['POST'])
@@ -5,6 +5,7 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///game_checklist.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256'
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -19,6 +20,10 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    # Don't stat template files on every render, even if FLASK_DEBUG is set
+    TEMPLATES_AUTO_RELOAD = False
+    # A single PBKDF2 iteration keeps set_password cheap in tests
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1'
 
 config = {
     'development': DevelopmentConfig,
@@ -0,0 +1,280 @@
+"""Shared fixtures for tests that run against one session-wide app."""
+
+import pytest
+import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+
+from app import create_app, db
+from app.models import User, Game, Checklist, ChecklistItem
+from config import TestingConfig
+
+
+# A named, shared-cache in-memory database: every connection opened with the
+# same URI sees the same data, not just the one the engine's pool holds
+MEMORY_DB_URI = 'sqlite:///file:testdb-{}?mode=memory&cache=shared&uri=true'
+MEMORY_DB_ENGINE_OPTIONS = {
+    'poolclass': StaticPool,
+    'connect_args': {'check_same_thread': False},
+}
+
+
+@lru_cache(maxsize=None)
+def build_app(config_key=()):
+    """Create one application per set of TestingConfig overrides.
+    
+    config_key is a sorted tuple of (name, value) pairs, so it can key the
+    cache. The overrides go into a TestingConfig subclass handed to
+    create_app, so they apply before the engine is bound.
+    """
+    # Name the database after the overrides so each cached app gets its own
+    settings = {
+        'SQLALCHEMY_DATABASE_URI': MEMORY_DB_URI.format(abs(hash(config_key))),
+        'SQLALCHEMY_ENGINE_OPTIONS': MEMORY_DB_ENGINE_OPTIONS,
+        **dict(config_key),
+    }
+    config_class = type('TestingConfigOverrides', (TestingConfig,), settings)
+    # create_app runs db.create_all, so each schema is only built once
+    app = create_app(config_class)
+    
+    with app.app_context():
+        engine = db.engine
+        # pysqlite only emits BEGIN before DML, so a SAVEPOINT would open (and
+        # its RELEASE commit) a transaction of its own. Take over transaction
+        # control so savepoints nest inside each test's outer transaction. The
+        # StaticPool connection already exists, so set it directly rather
+        # than from a connect listener.
+        with engine.connect() as conn:
+            conn.connection.driver_connection.isolation_level = None
+    
+    @event.listens_for(engine, 'begin')
+    def do_begin(conn):
+        conn.exec_driver_sql('BEGIN')
+    
+    snapshot_database(app)
+    return app
+
+
+def snapshot_database(app):
+    """Copy the app's database aside with SQLite's backup API.
+    
+    The copy is the baseline restore_database puts back, so the schema is
+    only ever built once per app.
+    """
+    snapshot = sqlite3.connect(':memory:', check_same_thread=False)
+    with app.app_context(), db.engine.connect() as conn:
+        conn.connection.driver_connection.backup(snapshot)
+    app.extensions['database_snapshot'] = snapshot
+
+
+def restore_database(app):
+    """Put the app's database back to its last snapshot."""
+    with app.app_context(), db.engine.connect() as conn:
+        driver_connection = conn.connection.driver_connection
+        app.extensions['database_snapshot'].backup(driver_connection)
+        # The connection may be a fresh one, so repeat build_app's
+        # transaction-control fix
+        driver_connection.isolation_level = None
+
+
+@contextmanager
+def collect_statements(engine):
+    """Collect the SQL statements executed on engine while the block runs."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@pytest.fixture
+def count_queries():
+    """Return a context manager that collects the SQL run on an engine.
+    
+    Use it as ``with count_queries(db.engine) as statements:``.
+    """
+    return collect_statements
+
+
+@pytest.fixture(scope='session')
+def app():
+    """Create one application and schema for the whole test session.
+    
+    Test modules that define their own ``app`` fixture override this one.
+    """
+    return build_app()
+
+
+@pytest.fixture(scope='session')
+def session_client(app):
+    """Create one test client for the whole test session."""
+    return app.test_client()
+
+
+@pytest.fixture
+def client(app, session_client):
+    """Return the session's test client, logged out.
+    
+    Test modules that define their own ``client`` fixture override this one.
+    """
+    # Tests log in by seeding the session cookie, so clear it between tests
+    session_client.delete_cookie(app.config['SESSION_COOKIE_NAME'])
+    return session_client
+
+
+@pytest.fixture
+def auth_client(client, user):
+    """Return the test client logged in as the ``user`` fixture's user.
+    
+    Test modules that create their own user override ``user`` with its id.
+    """
+    # Seed the Flask-Login session directly instead of POSTing to /auth/login,
+    # which would run a full request plus a password hash check per test.
+    # The login route itself is covered in test_basic.py.
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user)
+        sess['_fresh'] = True
+    
+    return client
+
+
+def begin_test_transaction():
+    """Route the current app's session through connections that can be rolled back.
+    
+    Returns the cleanup list end_test_transaction takes.
+    """
+    # Swap each engine for a connection with an open transaction, so the
+    # test, and any view it calls, reads and writes through it
+    engines = db.engines
+    cleanup = []
+    for key, engine in list(engines.items()):
+        connection = engine.connect()
+        transaction = connection.begin()
+        engines[key] = connection
+        cleanup.append((key, engine, connection, transaction))
+    
+    # Session commits release a savepoint rather than the outer transaction
+    db.session.configure(join_transaction_mode='create_savepoint')
+    return cleanup
+
+
+def end_test_transaction(app, cleanup):
+    """Undo everything since begin_test_transaction and put the engines back.
+    
+    Returns True if the test had ended the outer transaction itself and the
+    database was restored from its snapshot instead.
+    """
+    # A test that ended the outer transaction itself has committed its
+    # writes, and the session's savepoint went with it. Nothing can be
+    # rolled back, so throw the connection, and with it the in-memory
+    # database, away and restore the snapshot into a fresh one.
+    escaped = not all(
+        connection.connection.driver_connection.in_transaction
+        for key, engine, connection, transaction in cleanup
+    )
+    if escaped:
+        db.session().invalidate()
+    
+    db.session.remove()
+    db.session.configure(join_transaction_mode='conditional_savepoint')
+    engines = db.engines
+    for key, engine, connection, transaction in cleanup:
+        if not escaped:
+            transaction.rollback()
+        connection.close()
+        engines[key] = engine
+    
+    if escaped:
+        restore_database(app)
+    return escaped
+
+
+@pytest.fixture
+def db_session(app):
+    """Run a test inside a transaction that is rolled back afterwards."""
+    with app.app_context():
+        cleanup = begin_test_transaction()
+        yield db.session
+        end_test_transaction(app, cleanup)
+
+
+@contextmanager
+def baseline_session(app):
+    """Commit rows every test should see, outside the per-test transactions.
+    
+    Rolling a test back leaves these rows in place, and the snapshot is
+    refreshed afterwards, so they also survive a test that escapes its
+    rollback.
+    """
+    with app.app_context():
+        yield db.session
+        db.session.commit()
+        db.session.remove()
+    snapshot_database(app)
+
+
+@pytest.fixture(scope='session')
+def baseline(app):
+    """Return a context manager for committing rows every test should see.
+    
+    Use it as ``with baseline() as session:``.
+    """
+    return partial(baseline_session, app)
+
+
+@pytest.fixture(scope='session')
+def user(baseline):
+    """Create the test user once for the whole session and return its id."""
+    # Part of the baseline, so the password is only hashed once
+    with baseline() as session:
+        user = User(username='testuser', email='test@example.com')
+        user.set_password('password123')
+        session.add(user)
+        session.flush()
+        user_id = user.id
+    
+    return user_id
+
+
+@pytest.fixture
+def game(db_session):
+    """Create a game."""
+    game = Game(name='Test Game')
+    db_session.add(game)
+    db_session.flush()
+    return game
+
+
+@pytest.fixture
+def checklist(db_session, game, user):
+    """Create a public checklist for the game, owned by the test user."""
+    checklist = Checklist(
+        title='Test Checklist',
+        game=game,
+        creator_id=user,
+        is_public=True
+    )
+    db_session.add(checklist)
+    db_session.flush()
+    return checklist
+
+
+@pytest.fixture
+def item(db_session, checklist):
+    """Create an item on the checklist."""
+    item = ChecklistItem(
+        checklist=checklist,
+        title='Item 1',
+        description='Test item',
+        order=1
+    )
+    db_session.add(item)
+    db_session.flush()
+    return item
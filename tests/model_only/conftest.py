@@ -0,0 +1,49 @@
+"""Fixtures for model tests that only need SQLAlchemy, not the Flask app."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import User, Game, Checklist, ChecklistItem
+
+
+@pytest.fixture(scope='session')
+def engine():
+    """Create an in-memory database with the model schema, without create_app."""
+    engine = create_engine('sqlite://')
+    db.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """Run a test inside a transaction that is rolled back afterwards."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection)
+    
+    yield session
+    
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def item(session):
+    """Create an item on a checklist, with the game and creator it needs."""
+    # No test here logs in, so skip hashing a real password
+    user = User(username='testuser', email='test@example.com', password_hash='unused')
+    game = Game(name='Test Game')
+    checklist = Checklist(title='Test Checklist', game=game, creator=user, is_public=True)
+    item = ChecklistItem(
+        checklist=checklist,
+        title='Item 1',
+        description='Test item',
+        order=1
+    )
+    session.add(item)
+    session.flush()
+    return item
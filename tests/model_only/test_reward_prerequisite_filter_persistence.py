@@ -0,0 +1,43 @@
+"""Persistence tests for reward prerequisite location and category filters."""
+
+import pytest
+from sqlalchemy import select
+from app.models import Reward, ItemPrerequisite
+
+
+@pytest.mark.parametrize('reward_name,amount,consumes,location,category', [
+    pytest.param('Gold Coin', 10, False, 'Castle', None, id='location'),
+    pytest.param('Ruby', 5, True, None, 'Gems', id='category'),
+    pytest.param('Star', 3, False, 'Tower', 'Special', id='both-filters'),
+])
+def test_reward_prerequisite_filter(session, item, reward_name, amount, consumes, location, category):
+    """Test adding a reward prerequisite with location and/or category filters."""
+    # Create a reward
+    reward = Reward(name=reward_name)
+    session.add(reward)
+    session.flush()
+    
+    # Create prerequisite with the filters
+    prereq = ItemPrerequisite(
+        item_id=item.id,
+        prerequisite_reward_id=reward.id,
+        reward_amount=amount,
+        consumes_reward=consumes,
+        reward_location=location,
+        reward_category=category
+    )
+    session.add(prereq)
+    session.flush()
+    # Read back the stored row, not the instance still in the identity map
+    session.expire_all()
+    
+    # Verify the prerequisite was created with the filters
+    with session.no_autoflush:
+        saved_prereq = session.execute(
+            select(ItemPrerequisite).where(ItemPrerequisite.item_id == item.id)
+        ).scalar_one()
+    assert saved_prereq.prerequisite_reward_id == reward.id
+    assert saved_prereq.reward_amount == amount
+    assert saved_prereq.consumes_reward is consumes
+    assert saved_prereq.reward_location == location
+    assert saved_prereq.reward_category == category
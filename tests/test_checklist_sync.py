@@ -1,7 +1,4 @@
 import pytest
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app, db
 from app.models import User, Game, Checklist, ChecklistItem, UserChecklist, UserProgress
@@ -0,0 +1,29 @@
+"""Tests for the conftest db_session rollback and its snapshot restore."""
+
+from app import db
+from app.models import Game, User
+from tests.conftest import begin_test_transaction, end_test_transaction
+
+
+def test_escaped_commit_is_restored_from_snapshot(app, user):
+    """Test that a test ending its outer transaction is undone from the snapshot."""
+    with app.app_context():
+        # Commit a row past the rollback by ending the outer transaction
+        cleanup = begin_test_transaction()
+        db.session.add(Game(name='Leaked Game'))
+        db.session.flush()
+        db.session.connection().exec_driver_sql('COMMIT')
+        assert end_test_transaction(app, cleanup) is True
+        
+        # The next test sees the baseline, not the leaked row
+        cleanup = begin_test_transaction()
+        try:
+            assert Game.query.filter_by(name='Leaked Game').count() == 0
+            assert db.session.get(User, user) is not None
+            
+            # The restored connection still nests session commits in a savepoint
+            db.session.add(Game(name='Rolled Back Game'))
+            db.session.commit()
+            assert db.session.connection().connection.driver_connection.in_transaction
+        finally:
+            assert end_test_transaction(app, cleanup) is False
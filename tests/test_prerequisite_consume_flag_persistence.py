@@ -1,8 +1,5 @@
 import pytest
-import sys
-import os
 import json
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app, db
 from app.models import User, Game, Checklist, ChecklistItem, Reward, ItemPrerequisite
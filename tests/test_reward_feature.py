@@ -1,25 +1,43 @@
 import pytest
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app, db
 from app.models import User, Game, Checklist, ChecklistItem, UserChecklist, UserProgress, Reward, ItemReward
-import json
+from config import TestingConfig
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+import re
+
+# Load an item's ItemRewards and their Reward rows up front, rather than one
+# lazy SELECT for the collection plus one per ``item_reward.reward`` access.
+ITEM_REWARDS = selectinload(ChecklistItem.rewards).joinedload(ItemReward.reward)
+
+# Checklist fields sent with every batch update; tests add their own items
+BASE_PAYLOAD = {
+    'title': 'Test Checklist',
+    'description': '',
+    'is_public': True,
+    'deleted_items': [],
+}
+
+# Markers that must all appear on a checklist page showing reward badges
+REWARD_BADGE_MARKERS = re.compile(rb'Gold Coin|Experience|item-reward-badge|1x|Item without rewards')
 
 @pytest.fixture
 def app():
     """Create and configure a test app instance."""
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    app.config['WTF_CSRF_ENABLED'] = False
+    # Passing the config to create_app gives each test (and each xdist
+    # worker) its own in-memory database rather than the default file DB
+    app = create_app(TestingConfig)
     
     with app.app_context():
-        db.create_all()
+        # create_app has already built the schema in this database. The
+        # session keeps its production flags, so the views under test
+        # autoflush and expire on commit as they do outside tests.
         yield app
         db.session.remove()
-        db.drop_all()
+        # An in-memory database lives only as long as its connection, so
+        # disposing the engine discards it without issuing any DROP TABLEs
+        db.engine.dispose()
 
 @pytest.fixture
 def client(app):
@@ -27,49 +45,16 @@ def client(app):
     return app.test_client()
 
 @pytest.fixture
-def auth_client(client, app):
-    """Create an authenticated test client."""
-    with app.app_context():
-        # Create a test user
+def base_ids(app):
+    """Create the user, game and checklist shared by most tests and return their IDs."""
+    # Setup flushes explicitly, so skip the autoflush traversals
+    with db.session.no_autoflush:
         user = User(username='testuser', email='test@example.com')
         user.set_password('password123')
-        db.session.add(user)
-        db.session.commit()
-    
-    # Log in
-    client.post('/auth/login', data={
-        'username': 'testuser',
-        'password': 'password123'
-    })
-    
-    return client
-
-def test_reward_model_creation(app):
-    """Test that Reward model can be created."""
-    with app.app_context():
-        reward = Reward(name='Gold Coin')
-        db.session.add(reward)
-        db.session.commit()
-        
-        retrieved_reward = Reward.query.filter_by(name='Gold Coin').first()
-        assert retrieved_reward is not None
-        assert retrieved_reward.name == 'Gold Coin'
-
-def test_checklist_item_rewards_relationship(app):
-    """Test many-to-many relationship between ChecklistItem and Reward."""
-    with app.app_context():
-        # Create a game
         game = Game(name='Test Game')
-        db.session.add(game)
-        db.session.commit()
-        
-        # Create a user
-        user = User(username='testuser', email='test@example.com')
-        user.set_password('password')
-        db.session.add(user)
-        db.session.commit()
+        db.session.add_all([user, game])
+        db.session.flush()
         
-        # Create a checklist
         checklist = Checklist(
             title='Test Checklist',
             game_id=game.id,
@@ -77,251 +62,208 @@ def test_checklist_item_rewards_relationship(app):
             is_public=True
         )
         db.session.add(checklist)
-        db.session.commit()
-        
-        # Create an item
-        item = ChecklistItem(
-            checklist_id=checklist.id,
-            title='Test Item',
-            order=1
-        )
-        db.session.add(item)
-        db.session.commit()
-        
-        # Create rewards
-        reward1 = Reward(name='Gold Coin')
-        reward2 = Reward(name='Experience Points')
-        db.session.add(reward1)
-        db.session.add(reward2)
-        db.session.commit()
-        
-        # Add rewards to item using ItemReward
-        item_reward1 = ItemReward(checklist_item_id=item.id, reward_id=reward1.id, amount=2)
-        item_reward2 = ItemReward(checklist_item_id=item.id, reward_id=reward2.id, amount=1)
-        db.session.add(item_reward1)
-        db.session.add(item_reward2)
-        db.session.commit()
-        
-        # Verify relationships
-        retrieved_item = db.session.get(ChecklistItem, item.id)
-        assert len(retrieved_item.rewards) == 2
-        reward_names = [r.reward.name for r in retrieved_item.rewards]
-        assert 'Gold Coin' in reward_names
-        assert 'Experience Points' in reward_names
-        # Verify amounts
-        for item_reward in retrieved_item.rewards:
-            if item_reward.reward.name == 'Gold Coin':
-                assert item_reward.amount == 2
-            elif item_reward.reward.name == 'Experience Points':
-                assert item_reward.amount == 1
+        db.session.flush()
+    
+    # Read the ids before the commit expires them
+    ids = {'user_id': user.id, 'game_id': game.id, 'checklist_id': checklist.id}
+    db.session.commit()
+    return ids
 
-def test_batch_update_with_rewards(auth_client, app):
-    """Test batch updating items with rewards."""
-    with app.app_context():
-        # Create a game
-        game = Game(name='Test Game')
-        db.session.add(game)
-        db.session.commit()
-        
-        # Get the user
-        user = User.query.filter_by(username='testuser').first()
-        
-        # Create a checklist
-        checklist = Checklist(
-            title='Test Checklist',
-            game_id=game.id,
-            creator_id=user.id,
-            is_public=True
-        )
-        db.session.add(checklist)
-        db.session.commit()
-        
-        # Create an item
-        item = ChecklistItem(
-            checklist_id=checklist.id,
-            title='Item 1',
-            order=1
-        )
-        db.session.add(item)
-        db.session.commit()
-        
-        checklist_id = checklist.id
-        item_id = item.id
+@pytest.fixture
+def user(base_ids):
+    """Use the base_ids user wherever conftest's auth_client logs in."""
+    return base_ids['user_id']
+
+def test_reward_model_creation(app):
+    """Test that Reward model can be created."""
+    reward = Reward(name='Gold Coin')
+    db.session.add(reward)
+    db.session.commit()
     
-    # Update item via batch update with rewards (with amounts)
-    update_data = {
-        'title': 'Updated Checklist',
-        'description': 'Updated description',
-        'is_public': True,
-        'items': [
-            {
-                'id': item_id,
-                'title': 'Updated Item 1',
-                'description': 'Desc 1',
-                'category': 'Category A',
-                'rewards': [
-                    {'name': 'Gold Coin', 'amount': 3},
-                    {'name': 'Experience Points', 'amount': 5}
-                ]
-            }
-        ],
-        'deleted_items': []
-    }
+    retrieved_reward = Reward.query.filter_by(name='Gold Coin').first()
+    assert retrieved_reward is not None
+    assert retrieved_reward.name == 'Gold Coin'
+
+def test_checklist_item_rewards_relationship(app, base_ids):
+    """Test many-to-many relationship between ChecklistItem and Reward."""
+    checklist_id = base_ids['checklist_id']
     
-    response = auth_client.post(
-        f'/checklist/{checklist_id}/batch-update',
-        data=json.dumps(update_data),
-        content_type='application/json'
+    # Create an item
+    item = ChecklistItem(
+        checklist_id=checklist_id,
+        title='Test Item',
+        order=1
     )
+    db.session.add(item)
+    db.session.commit()
     
-    assert response.status_code == 200
-    data = json.loads(response.data)
-    assert data['success'] is True
+    # Create rewards
+    reward1 = Reward(name='Gold Coin')
+    reward2 = Reward(name='Experience Points')
+    db.session.add(reward1)
+    db.session.add(reward2)
+    db.session.commit()
     
-    with app.app_context():
-        item = db.session.get(ChecklistItem, item_id)
-        assert len(item.rewards) == 2
-        reward_names = [r.reward.name for r in item.rewards]
-        assert 'Gold Coin' in reward_names
-        assert 'Experience Points' in reward_names
-        # Check amounts
-        for item_reward in item.rewards:
-            if item_reward.reward.name == 'Gold Coin':
-                assert item_reward.amount == 3
-            elif item_reward.reward.name == 'Experience Points':
-                assert item_reward.amount == 5
+    # Add rewards to item using ItemReward
+    item_reward1 = ItemReward(checklist_item_id=item.id, reward_id=reward1.id, amount=2)
+    item_reward2 = ItemReward(checklist_item_id=item.id, reward_id=reward2.id, amount=1)
+    db.session.add(item_reward1)
+    db.session.add(item_reward2)
+    db.session.commit()
+    
+    # Verify relationships
+    retrieved_item = db.session.get(ChecklistItem, item.id, options=[ITEM_REWARDS])
+    assert len(retrieved_item.rewards) == 2
+    reward_names = [r.reward.name for r in retrieved_item.rewards]
+    assert 'Gold Coin' in reward_names
+    assert 'Experience Points' in reward_names
+    # Verify amounts
+    for item_reward in retrieved_item.rewards:
+        if item_reward.reward.name == 'Gold Coin':
+            assert item_reward.amount == 2
+        elif item_reward.reward.name == 'Experience Points':
+            assert item_reward.amount == 1
 
-def test_add_new_item_with_rewards_via_batch_update(auth_client, app):
-    """Test adding a new item with rewards via batch update."""
-    with app.app_context():
-        # Create a game
-        game = Game(name='Test Game')
-        db.session.add(game)
-        db.session.commit()
-        
-        # Get the user
-        user = User.query.filter_by(username='testuser').first()
-        
-        # Create a checklist
-        checklist = Checklist(
-            title='Test Checklist',
-            game_id=game.id,
-            creator_id=user.id,
-            is_public=True
-        )
-        db.session.add(checklist)
-        db.session.commit()
-        checklist_id = checklist.id
+@pytest.mark.parametrize('seed_items,items,expected,query_budget', [
+    pytest.param(
+        {'Item 1': []},
+        [{
+            'id': 'Item 1',
+            'title': 'Updated Item 1',
+            'description': 'Desc 1',
+            'category': 'Category A',
+            'rewards': [{'name': 'Gold Coin', 'amount': 3}, {'name': 'Experience Points', 'amount': 5}]
+        }],
+        {'Updated Item 1': {'Gold Coin': 3, 'Experience Points': 5}},
+        13,
+        id='existing-item-gains-rewards'
+    ),
+    pytest.param(
+        {},
+        [{
+            'id': 'new',
+            'title': 'New Item',
+            'description': 'New Description',
+            'category': 'New Category',
+            'rewards': [{'name': 'Diamond', 'amount': 1}, {'name': 'Rare Item', 'amount': 1}]
+        }],
+        {'New Item': {'Diamond': 1, 'Rare Item': 1}},
+        11,
+        id='new-item-with-rewards'
+    ),
+    pytest.param(
+        {'Item 1': [('Old Reward', 1)]},
+        [{
+            'id': 'Item 1',
+            'title': 'Item 1',
+            'description': '',
+            'category': '',
+            'rewards': [{'name': 'New Reward 1', 'amount': 1}, {'name': 'New Reward 2', 'amount': 1}]
+        }],
+        {'Item 1': {'New Reward 1': 1, 'New Reward 2': 1}},
+        13,
+        id='replaces-old-rewards'
+    ),
+    pytest.param(
+        {},
+        [
+            {'id': 'new', 'title': 'Item 1', 'description': '', 'category': '',
+             'rewards': [{'name': 'Shared Reward', 'amount': 1}]},
+            {'id': 'new', 'title': 'Item 2', 'description': '', 'category': '',
+             'rewards': [{'name': 'Shared Reward', 'amount': 1}]}
+        ],
+        {'Item 1': {'Shared Reward': 1}, 'Item 2': {'Shared Reward': 1}},
+        12,
+        id='reward-reused-across-items'
+    ),
+])
+def test_batch_update_rewards(auth_client, app, base_ids, count_queries, seed_items, items, expected, query_budget):
+    """Test that batch updates create, replace and reuse item rewards.
+    
+    seed_items maps the titles of items that exist before the update to their
+    (reward name, amount) pairs; payload items refer to them by that title.
+    expected maps each item title after the update to its {reward name: amount}.
+    """
+    checklist_id = base_ids['checklist_id']
+    
+    # Create the pre-existing items and rewards, flushing explicitly
+    seeded = {}
+    with db.session.no_autoflush:
+        for order, (title, rewards) in enumerate(seed_items.items(), start=1):
+            item = ChecklistItem(checklist_id=checklist_id, title=title, order=order)
+            db.session.add(item)
+            db.session.flush()
+            seeded[title] = item.id
+            for name, amount in rewards:
+                reward = Reward(name=name)
+                db.session.add(reward)
+                db.session.flush()
+                db.session.add(ItemReward(checklist_item_id=item.id, reward_id=reward.id, amount=amount))
+    db.session.commit()
     
-    # Add a new item via batch update with rewards
     update_data = {
-        'title': 'Test Checklist',
-        'description': '',
-        'is_public': True,
-        'items': [
-            {
-                'id': 'new',
-                'title': 'New Item',
-                'description': 'New Description',
-                'category': 'New Category',
-                'rewards': [{'name': 'Diamond', 'amount': 1}, {'name': 'Rare Item', 'amount': 1}]
-            }
-        ],
-        'deleted_items': []
+        **BASE_PAYLOAD,
+        'items': [dict(item, id=seeded.get(item['id'], item['id'])) for item in items]
     }
     
-    response = auth_client.post(
-        f'/checklist/{checklist_id}/batch-update',
-        data=json.dumps(update_data),
-        content_type='application/json'
-    )
+    # The query budget catches per-row lookups creeping into the view
+    with count_queries(db.engine) as statements:
+        response = auth_client.post(
+            f'/checklist/{checklist_id}/batch-update',
+            json=update_data
+        )
     
     assert response.status_code == 200
-    data = json.loads(response.data)
-    assert data['success'] is True
+    assert len(statements) <= query_budget, statements
+    assert response.get_json()['success'] is True
     
-    with app.app_context():
-        item = ChecklistItem.query.filter_by(title='New Item').first()
-        assert item is not None
-        assert len(item.rewards) == 2
-        reward_names = [r.reward.name for r in item.rewards]
-        assert 'Diamond' in reward_names
-        assert 'Rare Item' in reward_names
+    # The view shares this session; expire it so the checks below read the
+    # committed rows rather than the view's in-memory objects
+    db.session.expire_all()
+    items = ChecklistItem.query.options(ITEM_REWARDS).filter_by(checklist_id=checklist_id).all()
+    actual = {
+        item.title: {item_reward.reward.name: item_reward.amount for item_reward in item.rewards}
+        for item in items
+    }
+    assert actual == expected
+    
+    # Each reward name maps to exactly one Reward row, including rewards that
+    # were dropped from an item or shared between items
+    reward_names = {name for rewards in seed_items.values() for name, _ in rewards}
+    reward_names.update(name for rewards in expected.values() for name in rewards)
+    assert db.session.query(func.count(Reward.id)).scalar() == len(reward_names)
 
-def test_get_rewards_endpoint(auth_client, app):
+def test_get_rewards_endpoint(auth_client, app, base_ids, count_queries):
     """Test the API endpoint that returns unique rewards for a checklist."""
-    with app.app_context():
-        # Create a game
-        game = Game(name='Test Game')
-        db.session.add(game)
-        db.session.commit()
-        
-        # Get the user
-        user = User.query.filter_by(username='testuser').first()
-        
-        # Create a checklist
-        checklist = Checklist(
-            title='Test Checklist',
-            game_id=game.id,
-            creator_id=user.id,
-            is_public=True
-        )
-        db.session.add(checklist)
-        db.session.commit()
-        
-        # Create rewards
-        reward1 = Reward(name='Gold Coin')
-        reward2 = Reward(name='Experience Points')
-        reward3 = Reward(name='Diamond')
-        db.session.add(reward1)
-        db.session.add(reward2)
-        db.session.add(reward3)
-        db.session.commit()
-        
-        # Create items with various rewards
-        item1 = ChecklistItem(
-            checklist_id=checklist.id,
-            title='Item 1',
-            order=1
-        )
-        db.session.add(item1)
-        db.session.flush()
-        
-        item_reward1_1 = ItemReward(checklist_item_id=item1.id, reward_id=reward1.id, amount=1)
-        item_reward1_2 = ItemReward(checklist_item_id=item1.id, reward_id=reward2.id, amount=1)
-        db.session.add(item_reward1_1)
-        db.session.add(item_reward1_2)
-        
-        item2 = ChecklistItem(
-            checklist_id=checklist.id,
-            title='Item 2',
-            order=2
-        )
-        db.session.add(item2)
-        db.session.flush()
-        
-        item_reward2_1 = ItemReward(checklist_item_id=item2.id, reward_id=reward2.id, amount=1)
-        item_reward2_2 = ItemReward(checklist_item_id=item2.id, reward_id=reward3.id, amount=1)
-        db.session.add(item_reward2_1)
-        db.session.add(item_reward2_2)
-        
-        item3 = ChecklistItem(
-            checklist_id=checklist.id,
-            title='Item 3',
-            order=3
-        )
-        # No rewards
-        
-        db.session.add(item3)
-        db.session.commit()
-        
-        checklist_id = checklist.id
+    checklist_id = base_ids['checklist_id']
     
-    # Get rewards
-    response = auth_client.get(f'/checklist/{checklist_id}/rewards')
+    # Setup-only rows go straight to executemany inserts, skipping the unit of
+    # work; return_defaults fills in the generated ids on each mapping
+    reward_rows = [{'name': name} for name in ('Gold Coin', 'Experience Points', 'Diamond')]
+    db.session.bulk_insert_mappings(Reward, reward_rows, return_defaults=True)
+    item_rows = [
+        {'checklist_id': checklist_id, 'title': f'Item {order}', 'order': order}
+        for order in (1, 2, 3)
+    ]
+    db.session.bulk_insert_mappings(ChecklistItem, item_rows, return_defaults=True)
+    
+    # Item 1 and Item 2 share Experience Points; Item 3 has no rewards
+    db.session.bulk_insert_mappings(ItemReward, [
+        {'checklist_item_id': item_rows[0]['id'], 'reward_id': reward_rows[0]['id'], 'amount': 1},
+        {'checklist_item_id': item_rows[0]['id'], 'reward_id': reward_rows[1]['id'], 'amount': 1},
+        {'checklist_item_id': item_rows[1]['id'], 'reward_id': reward_rows[1]['id'], 'amount': 1},
+        {'checklist_item_id': item_rows[1]['id'], 'reward_id': reward_rows[2]['id'], 'amount': 1},
+    ])
+    db.session.commit()
+    
+    # Get rewards - one query for the checklist plus one for the reward
+    # names, however many items there are
+    with count_queries(db.engine) as statements:
+        response = auth_client.get(f'/checklist/{checklist_id}/rewards')
     assert response.status_code == 200
+    assert len(statements) <= 2, statements
     
-    data = json.loads(response.data)
+    data = response.get_json()
     rewards = data['rewards']
     
     # Should return all unique rewards
@@ -330,249 +272,80 @@ def test_get_rewards_endpoint(auth_client, app):
     assert 'Experience Points' in rewards
     assert 'Diamond' in rewards
 
-def test_view_checklist_with_rewards(auth_client, app):
+def test_view_checklist_with_rewards(auth_client, app, base_ids):
     """Test viewing a checklist that has items with rewards."""
-    with app.app_context():
-        # Create a game
-        game = Game(name='Test Game')
-        db.session.add(game)
-        db.session.commit()
-        
-        # Get the user
-        user = User.query.filter_by(username='testuser').first()
-        
-        # Create a checklist
-        checklist = Checklist(
-            title='Test Checklist',
-            game_id=game.id,
-            creator_id=user.id,
-            is_public=True
-        )
-        db.session.add(checklist)
-        db.session.commit()
-        
-        # Create rewards
-        reward1 = Reward(name='Gold Coin')
-        reward2 = Reward(name='Experience')
-        db.session.add(reward1)
-        db.session.add(reward2)
-        db.session.commit()
-        
-        # Create items with rewards
-        item1 = ChecklistItem(
-            checklist_id=checklist.id,
-            title='Item 1',
-            order=1
-        )
-        db.session.add(item1)
-        db.session.flush()
-        
-        item_reward1 = ItemReward(checklist_item_id=item1.id, reward_id=reward1.id, amount=1)
-        db.session.add(item_reward1)
-        
-        item2 = ChecklistItem(
-            checklist_id=checklist.id,
-            title='Item 2',
-            order=2
-        )
-        db.session.add(item2)
-        db.session.flush()
-        
-        item_reward2 = ItemReward(checklist_item_id=item2.id, reward_id=reward2.id, amount=1)
-        db.session.add(item_reward2)
-        
-        db.session.commit()
-        checklist_id = checklist.id
+    checklist_id = base_ids['checklist_id']
     
-    # View the checklist
-    response = auth_client.get(f'/checklist/{checklist_id}')
-    assert response.status_code == 200
+    # Create rewards
+    reward1 = Reward(name='Gold Coin')
+    reward2 = Reward(name='Experience')
+    db.session.add(reward1)
+    db.session.add(reward2)
+    db.session.commit()
     
-    # Check that reward badges are shown (with amounts now)
-    assert b'Gold Coin' in response.data
-    assert b'Experience' in response.data
-    assert b'item-reward-badge' in response.data
-    assert b'1x' in response.data  # Check amount is displayed
-
-def test_item_without_rewards(auth_client, app):
-    """Test that items without rewards still work correctly."""
-    with app.app_context():
-        # Create a game
-        game = Game(name='Test Game')
-        db.session.add(game)
-        db.session.commit()
-        
-        # Get the user
-        user = User.query.filter_by(username='testuser').first()
-        
-        # Create a checklist
-        checklist = Checklist(
-            title='Test Checklist',
-            game_id=game.id,
-            creator_id=user.id,
-            is_public=True
-        )
-        db.session.add(checklist)
-        db.session.commit()
-        
-        # Create an item without rewards
-        item = ChecklistItem(
-            checklist_id=checklist.id,
-            title='Item without rewards',
-            order=1
-        )
-        db.session.add(item)
-        db.session.commit()
-        checklist_id = checklist.id
-        item_id = item.id
+    # Create items with rewards
+    item1 = ChecklistItem(
+        checklist_id=checklist_id,
+        title='Item 1',
+        order=1
+    )
+    db.session.add(item1)
+    db.session.flush()
     
-    # View the checklist
-    response = auth_client.get(f'/checklist/{checklist_id}')
-    assert response.status_code == 200
-    assert b'Item without rewards' in response.data
+    item_reward1 = ItemReward(checklist_item_id=item1.id, reward_id=reward1.id, amount=1)
+    db.session.add(item_reward1)
     
-    # Verify item has no rewards
-    with app.app_context():
-        item = ChecklistItem.query.get(item_id)
-        assert len(item.rewards) == 0
-
-def test_update_rewards_removes_old_rewards(auth_client, app):
-    """Test that updating rewards removes old rewards and adds new ones."""
-    with app.app_context():
-        # Create a game
-        game = Game(name='Test Game')
-        db.session.add(game)
-        db.session.commit()
-        
-        # Get the user
-        user = User.query.filter_by(username='testuser').first()
-        
-        # Create a checklist
-        checklist = Checklist(
-            title='Test Checklist',
-            game_id=game.id,
-            creator_id=user.id,
-            is_public=True
-        )
-        db.session.add(checklist)
-        db.session.commit()
-        
-        # Create rewards
-        reward1 = Reward(name='Old Reward')
-        db.session.add(reward1)
-        db.session.commit()
-        
-        # Create an item with old reward
-        item = ChecklistItem(
-            checklist_id=checklist.id,
-            title='Item 1',
-            order=1
-        )
-        db.session.add(item)
-        db.session.flush()
-        
-        item_reward1 = ItemReward(checklist_item_id=item.id, reward_id=reward1.id, amount=1)
-        db.session.add(item_reward1)
-        db.session.commit()
-        
-        checklist_id = checklist.id
-        item_id = item.id
+    item2 = ChecklistItem(
+        checklist_id=checklist_id,
+        title='Item 2',
+        order=2
+    )
+    db.session.add(item2)
+    db.session.flush()
     
-    # Update item with new rewards
-    update_data = {
-        'title': 'Test Checklist',
-        'description': '',
-        'is_public': True,
-        'items': [
-            {
-                'id': item_id,
-                'title': 'Item 1',
-                'description': '',
-                'category': '',
-                'rewards': [{'name': 'New Reward 1', 'amount': 1}, {'name': 'New Reward 2', 'amount': 1}]
-            }
-        ],
-        'deleted_items': []
-    }
+    item_reward2 = ItemReward(checklist_item_id=item2.id, reward_id=reward2.id, amount=1)
+    db.session.add(item_reward2)
     
-    response = auth_client.post(
-        f'/checklist/{checklist_id}/batch-update',
-        data=json.dumps(update_data),
-        content_type='application/json'
+    # An item without rewards must render alongside the badged ones
+    item3 = ChecklistItem(
+        checklist_id=checklist_id,
+        title='Item without rewards',
+        order=3
     )
+    db.session.add(item3)
     
+    db.session.commit()
+    
+    # View the checklist - this is the one test in this module that renders
+    # the template; the rest assert through the JSON endpoints
+    response = auth_client.get(f'/checklist/{checklist_id}')
     assert response.status_code == 200
     
-    with app.app_context():
-        item = ChecklistItem.query.get(item_id)
-        assert len(item.rewards) == 2
-        reward_names = [r.reward.name for r in item.rewards]
-        assert 'New Reward 1' in reward_names
-        assert 'New Reward 2' in reward_names
-        assert 'Old Reward' not in reward_names
+    # Check that reward badges are shown (with amounts now) in a single
+    # scan of the rendered page
+    found = set(REWARD_BADGE_MARKERS.findall(response.data))
+    assert found == {b'Gold Coin', b'Experience', b'item-reward-badge', b'1x', b'Item without rewards'}
 
-def test_reward_reuse_across_items(auth_client, app):
-    """Test that the same reward can be used for multiple items."""
-    with app.app_context():
-        # Create a game
-        game = Game(name='Test Game')
-        db.session.add(game)
-        db.session.commit()
-        
-        # Get the user
-        user = User.query.filter_by(username='testuser').first()
-        
-        # Create a checklist
-        checklist = Checklist(
-            title='Test Checklist',
-            game_id=game.id,
-            creator_id=user.id,
-            is_public=True
-        )
-        db.session.add(checklist)
-        db.session.commit()
-        checklist_id = checklist.id
-    
-    # Add two items with the same reward
-    update_data = {
-        'title': 'Test Checklist',
-        'description': '',
-        'is_public': True,
-        'items': [
-            {
-                'id': 'new',
-                'title': 'Item 1',
-                'description': '',
-                'category': '',
-                'rewards': [{'name': 'Shared Reward', 'amount': 1}]
-            },
-            {
-                'id': 'new',
-                'title': 'Item 2',
-                'description': '',
-                'category': '',
-                'rewards': [{'name': 'Shared Reward', 'amount': 1}]
-            }
-        ],
-        'deleted_items': []
-    }
+def test_item_without_rewards(auth_client, app, base_ids):
+    """Test that items without rewards still work correctly."""
+    checklist_id = base_ids['checklist_id']
     
-    response = auth_client.post(
-        f'/checklist/{checklist_id}/batch-update',
-        data=json.dumps(update_data),
-        content_type='application/json'
+    # Create an item without rewards
+    item = ChecklistItem(
+        checklist_id=checklist_id,
+        title='Item without rewards',
+        order=1
     )
+    db.session.add(item)
+    db.session.commit()
+    item_id = item.id
     
+    # The checklist exposes no rewards
+    response = auth_client.get(f'/checklist/{checklist_id}/rewards')
     assert response.status_code == 200
+    assert response.get_json()['rewards'] == []
     
-    with app.app_context():
-        # Should only create one reward object
-        rewards = Reward.query.filter_by(name='Shared Reward').all()
-        assert len(rewards) == 1
-        
-        # Both items should have the same reward
-        items = ChecklistItem.query.filter_by(checklist_id=checklist_id).all()
-        assert len(items) == 2
-        for item in items:
-            assert len(item.rewards) == 1
-            assert item.rewards[0].reward.name == 'Shared Reward'
+    # Verify item has no rewards, as stored rather than as held in the session
+    db.session.expire_all()
+    item = db.session.get(ChecklistItem, item_id, options=[ITEM_REWARDS])
+    assert len(item.rewards) == 0